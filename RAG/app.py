@@ -9,8 +9,8 @@ Date: October 2025
 
 import streamlit as st
 from sentence_transformers import SentenceTransformer
-import faiss
 import numpy as np
+from retrieval import ShardedIndex, detect_language
 
 # ============================================================================
 # STEP 1: PAGE CONFIGURATION
@@ -58,6 +58,12 @@ A: UHIP is mandatory health insurance for international students in Ontario. It
 
 lines = [line.strip() for line in faq_text.split("\n") if line.strip()]
 
+# Detect the language of every line so each language gets its own index
+line_languages = [detect_language(line) for line in lines]
+
+# Language codes used by the UI buttons
+LANGUAGE_CODES = {"English": "en", "Spanish": "es"}
+
 # ============================================================================
 # STEP 4: LOAD MODEL AND CREATE INDEX
 # ============================================================================
@@ -65,7 +71,7 @@ lines = [line.strip() for line in faq_text.split("\n") if line.strip()]
 @st.cache_resource
 def load_everything():
     """
-    This function loads the model and creates the FAISS index
+    This function loads the model and creates one FAISS index per language
     It only runs ONCE (cached) to make the app faster
     """
     # Load the sentence transformer model
@@ -74,10 +80,8 @@ def load_everything():
     # Create embeddings for all lines
     embeddings = model.encode(lines)
     
-    # Build FAISS index
-    dimension = embeddings.shape[1]
-    index = faiss.IndexFlatL2(dimension)
-    index.add(np.array(embeddings))
+    # Build the sharded FAISS index (English shard, Spanish shard)
+    index = ShardedIndex(np.array(embeddings), line_languages)
     
     return model, index
 
@@ -219,12 +223,22 @@ if search_button and user_question:
         # Convert user question to vector
         q_emb = model.encode([user_question])
         
-        # Search in FAISS index for 5 most similar
-        D, I = index.search(np.array(q_emb), k=5)
-        
         # Set confidence threshold
         threshold = 1.5
         
+        # Search other language shards when there is no "High Confidence" match
+        fallback_threshold = 1.0  # same as the "High Confidence" cutoff
+        
+        # Detect the query language (selected UI language wins on a tie)
+        query_language = detect_language(
+            user_question,
+            default=LANGUAGE_CODES[st.session_state.language]
+        )
+        
+        # Search the matching language shard first for 5 most similar.
+        # Other shards are only searched if there is no high confidence match
+        D, I = index.search(np.array(q_emb), query_language, k=5, fallback_threshold=fallback_threshold)
+        
         # Look for an answer line (A:)
         answer_found = None
         distance = 999
@@ -275,10 +289,10 @@ if search_button and user_question:
             # Question not in database
             confidence = "🔴 Topic Not Found"
             box_type = "error"
-        elif distance < 1.0:
+        elif distance < fallback_threshold:
             confidence = "🟢 High Confidence"
             box_type = "success"
-        elif distance < 1.5:
+        elif distance < threshold:
             confidence = "🟡 Medium Confidence"
             box_type = "info"
         else:
@@ -326,7 +340,7 @@ with col1:
     st.metric("FAQ Topics", "6")
 
 with col2:
-    st.metric("Languages", "2")
+    st.metric("Languages", len(index.languages))
 
 with col3:
     st.metric("Vector Size", "384")
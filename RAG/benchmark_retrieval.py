@@ -0,0 +1,179 @@
+"""
+Lambton College Ottawa - Campus Survival Guide Chatbot
+Benchmark: single FAISS index vs. language-sharded index
+Student: Enrique Fernandez C.
+Date: October 2025
+
+The real FAQ only has a few lines, so this script builds a synthetic
+corpus: the same topics written in many languages. Each embedding is
+
+    topic vector + language offset + noise
+
+and each query should find the entry with the same topic AND language.
+We compare:
+
+1. Single IndexFlatL2 with every language (what app.py used before)
+2. Sharded index, routed to the query language, no fallback
+3. Sharded index, routed, with parallel fallback on a low score
+
+A fraction of the queries are routed to the WRONG language to simulate
+mistakes of the language detector, which is what the fallback is for.
+
+Run: python benchmark_retrieval.py
+"""
+
+import time
+
+import faiss
+import numpy as np
+
+from retrieval import ShardedIndex
+
+# ============================================================================
+# STEP 1: BENCHMARK SETTINGS
+# ============================================================================
+
+DIMENSION = 384                          # Same as all-MiniLM-L6-v2
+CORPUS_SIZES = [10_000, 50_000, 200_000]
+LANGUAGE_COUNTS = [2, 8, 20]
+N_QUERIES = 200
+K = 5
+
+NOISE = 0.3                              # Noise of entries and queries
+LANGUAGE_SCALE = 0.3                     # Distance between languages
+DETECTOR_ERROR_RATE = 0.1                # Queries routed to the wrong shard
+
+# Halfway between the expected distance to the right entry (2 * NOISE^2)
+# and to the same topic in another language (2 * NOISE^2 + 2 * LANGUAGE_SCALE^2)
+FALLBACK_THRESHOLD = 2 * NOISE ** 2 + LANGUAGE_SCALE ** 2
+
+rng = np.random.default_rng(42)
+
+
+# ============================================================================
+# STEP 2: SYNTHETIC CORPUS
+# ============================================================================
+
+def unit_vectors(n, dimension):
+    vectors = rng.standard_normal((n, dimension)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def make_corpus(corpus_size, n_languages):
+    """
+    Build corpus_size embeddings spread over n_languages languages.
+    Returns embeddings, language of each entry, topic of each entry,
+    topic vectors and language vectors.
+    """
+    n_topics = corpus_size // n_languages
+
+    topics = unit_vectors(n_topics, DIMENSION)
+    language_offsets = LANGUAGE_SCALE * unit_vectors(n_languages, DIMENSION)
+
+    entry_topics = np.tile(np.arange(n_topics), n_languages)
+    entry_languages = np.repeat(np.arange(n_languages), n_topics)
+
+    noise = NOISE / np.sqrt(DIMENSION) * rng.standard_normal((len(entry_topics), DIMENSION))
+    embeddings = topics[entry_topics] + language_offsets[entry_languages] + noise
+
+    return embeddings.astype(np.float32), entry_languages, entry_topics, topics, language_offsets
+
+
+def make_queries(topics, language_offsets, n_topics, n_languages):
+    """
+    Queries are new noisy versions of existing entries.
+    The ground truth is the entry with the same topic and language.
+    """
+    query_topics = rng.integers(0, n_topics, N_QUERIES)
+    query_languages = rng.integers(0, n_languages, N_QUERIES)
+
+    noise = NOISE / np.sqrt(DIMENSION) * rng.standard_normal((N_QUERIES, DIMENSION))
+    queries = topics[query_topics] + language_offsets[query_languages] + noise
+
+    # Entries are stored language by language, so the id is easy to compute
+    ground_truth = query_languages * n_topics + query_topics
+
+    # Simulate detector mistakes: route some queries to a random other language
+    routed = query_languages.copy()
+    wrong = rng.random(N_QUERIES) < DETECTOR_ERROR_RATE
+    if n_languages > 1:
+        shift = rng.integers(1, n_languages, N_QUERIES)
+        routed[wrong] = (query_languages[wrong] + shift[wrong]) % n_languages
+
+    return queries.astype(np.float32), routed, ground_truth
+
+
+# ============================================================================
+# STEP 3: RUN ONE CONFIGURATION
+# ============================================================================
+
+def evaluate(search_function, queries, routed, ground_truth):
+    """
+    Send the queries one by one (like the app does) and measure
+    average latency (ms per query) and top-1 accuracy (%).
+    """
+    top_ids = []
+    start_time = time.time()
+
+    for query, language in zip(queries, routed):
+        D, I = search_function(query[None, :], str(language))
+        top_ids.append(I[0, 0] if I.shape[1] > 0 else -1)
+
+    end_time = time.time()
+
+    latency_ms = (end_time - start_time) / len(queries) * 1000
+    accuracy = (np.array(top_ids) == ground_truth).mean() * 100
+    return latency_ms, accuracy
+
+
+def benchmark(corpus_size, n_languages):
+    embeddings, entry_languages, _, topics, language_offsets = make_corpus(corpus_size, n_languages)
+    n_topics = corpus_size // n_languages
+    queries, routed, ground_truth = make_queries(topics, language_offsets, n_topics, n_languages)
+
+    # 1. Single index with every language
+    single = faiss.IndexFlatL2(DIMENSION)
+    single.add(embeddings)
+    single_result = evaluate(lambda q, lang: single.search(q, K), queries, routed, ground_truth)
+
+    # 2 and 3. Sharded index
+    with ShardedIndex(embeddings, entry_languages.astype(str)) as sharded:
+        no_fallback = evaluate(
+            lambda q, lang: sharded.search(q, lang, k=K, fallback_threshold=np.inf),
+            queries, routed, ground_truth
+        )
+        with_fallback = evaluate(
+            lambda q, lang: sharded.search(q, lang, k=K, fallback_threshold=FALLBACK_THRESHOLD),
+            queries, routed, ground_truth
+        )
+
+    return single_result, no_fallback, with_fallback
+
+
+# ============================================================================
+# STEP 4: PRINT RESULTS
+# ============================================================================
+
+if __name__ == "__main__":
+    print("SHARDED RETRIEVAL BENCHMARK")
+    print(f"Dimension: {DIMENSION}, queries: {N_QUERIES}, k: {K}, "
+          f"detector error rate: {DETECTOR_ERROR_RATE:.0%}, "
+          f"fallback threshold: {FALLBACK_THRESHOLD:.3f}")
+    print("-" * 96)
+    print(f"{'Entries':>9} {'Langs':>6} | {'Single ms':>9} {'Acc %':>6} | "
+          f"{'Routed ms':>9} {'Acc %':>6} | {'Fallback ms':>11} {'Acc %':>6} | {'Speedup':>7}")
+    print("-" * 96)
+
+    for corpus_size in CORPUS_SIZES:
+        for n_languages in LANGUAGE_COUNTS:
+            single, routed, fallback = benchmark(corpus_size, n_languages)
+            speedup = single[0] / fallback[0]
+            print(f"{corpus_size:>9,} {n_languages:>6} | "
+                  f"{single[0]:>9.3f} {single[1]:>6.1f} | "
+                  f"{routed[0]:>9.3f} {routed[1]:>6.1f} | "
+                  f"{fallback[0]:>11.3f} {fallback[1]:>6.1f} | "
+                  f"{speedup:>6.1f}x")
+
+    print("-" * 96)
+    print("Routed = only the detected language shard is searched.")
+    print("Fallback = other shards are searched in parallel when the best distance is above the threshold.")
@@ -0,0 +1,184 @@
+"""
+Lambton College Ottawa - Campus Survival Guide Chatbot
+Language-aware sharded retrieval - Software Tools and Emerging Technologies for AI and ML (AML-3303)
+Student: Enrique Fernandez C.
+Date: October 2025
+
+Instead of one FAISS index holding every language, each language gets
+its own index (a "shard"). A query goes to the shard of its language
+first, and only searches the other shards when the best match there is
+not good enough. The fallback searches run in parallel and their
+results are merged by distance.
+
+This file has no Streamlit code so it can be reused by the app and by
+benchmark_retrieval.py.
+"""
+
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import faiss
+import numpy as np
+
+# ============================================================================
+# STEP 1: LIGHTWEIGHT LANGUAGE DETECTOR
+# ============================================================================
+
+# Function words (articles, prepositions, pronouns, question words) for each
+# language. They are not tied to any topic, so they work for any FAQ.
+# Add a new entry to support a new language.
+STOPWORDS = {
+    "en": {"the", "a", "an", "is", "are", "was", "do", "does", "how", "what",
+           "where", "when", "which", "who", "why", "can", "i", "you", "it", "my",
+           "your", "to", "in", "on", "at", "of", "for", "with", "and", "or",
+           "much", "many", "there", "this", "that"},
+    "es": {"el", "la", "los", "las", "un", "una", "es", "son", "cómo", "como",
+           "qué", "que", "dónde", "donde", "cuándo", "cuando", "cuál", "quién",
+           "por", "cuánto", "cuanto", "yo", "mi", "tu", "lo", "a", "de", "en",
+           "con", "para", "y", "o", "del", "al", "hay", "este", "esta", "está",
+           "están"},
+}
+
+# Characters that only (or almost only) appear in one language
+SPECIAL_CHARS = {
+    "es": set("¿¡ñáéíóú"),
+}
+
+WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def detect_language(text, default="en"):
+    """
+    Guess the language of a short text by counting common words and
+    special characters. Returns a language code like "en" or "es".
+    If nothing matches, the default language is returned.
+    """
+    text = text.lower()
+    words = WORD_PATTERN.findall(text)
+
+    scores = {}
+    for language, stopwords in STOPWORDS.items():
+        score = sum(1 for word in words if word in stopwords)
+        score += 2 * sum(1 for char in text if char in SPECIAL_CHARS.get(language, ()))
+        scores[language] = score
+
+    best_language = max(scores, key=scores.get)
+    if scores[best_language] == 0:
+        return default
+
+    # On a tie keep the default (the language selected in the UI)
+    if scores.get(default, 0) == scores[best_language]:
+        return default
+
+    return best_language
+
+
+# ============================================================================
+# STEP 2: SHARDED INDEX (ONE FAISS INDEX PER LANGUAGE)
+# ============================================================================
+
+class ShardedIndex:
+    """
+    One IndexFlatL2 per language. Every shard remembers the position of
+    its vectors in the original list of lines, so search results use the
+    same ids as a single big index would.
+
+    Call close() when done, or use it as a context manager:
+
+        with ShardedIndex(embeddings, languages) as index:
+            D, I = index.search(query, "en")
+    """
+
+    def __init__(self, embeddings, languages, max_workers=None):
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        languages = np.asarray(languages)
+
+        self.dimension = embeddings.shape[1]
+        self.shards = {}
+        self.ids = {}
+
+        for language in np.unique(languages):
+            positions = np.where(languages == language)[0]
+            index = faiss.IndexFlatL2(self.dimension)
+            index.add(embeddings[positions])
+            self.shards[str(language)] = index
+            self.ids[str(language)] = positions
+
+        self.executor = ThreadPoolExecutor(max_workers=max_workers or len(self.shards))
+
+    def close(self):
+        """
+        Stop the thread pool used for parallel shard searches.
+        """
+        self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def languages(self):
+        return list(self.shards.keys())
+
+    @property
+    def ntotal(self):
+        return sum(index.ntotal for index in self.shards.values())
+
+    def search_shard(self, language, query, k):
+        """
+        Search one shard and convert local positions into global ids.
+        """
+        index = self.shards[language]
+        D, I = index.search(query, min(k, index.ntotal))
+        return D, self.ids[language][I]
+
+    def search(self, query, language, k=5, fallback_threshold=1.0):
+        """
+        Search the shard for `language` first. If its best distance is
+        above `fallback_threshold` (a low score), the other shards are
+        searched in parallel and all results are merged by distance.
+
+        Returns (D, I) with shape (n_queries, <=k), like index.search().
+        """
+        query = np.asarray(query, dtype=np.float32)
+
+        if language not in self.shards:
+            # Unknown language: search every shard
+            return self.search_all(query, k)
+
+        D, I = self.search_shard(language, query, k)
+
+        if D.shape[1] > 0 and D[:, 0].max() <= fallback_threshold:
+            return D, I
+
+        others = [lang for lang in self.shards if lang != language]
+
+        if len(others) == 1:
+            # Only one other shard (e.g. English/Spanish): no need for the pool
+            results = [(D, I), self.search_shard(others[0], query, k)]
+        else:
+            futures = [self.executor.submit(self.search_shard, lang, query, k) for lang in others]
+            results = [(D, I)] + [future.result() for future in futures]
+
+        return merge_results(results, k)
+
+    def search_all(self, query, k=5):
+        """
+        Search every shard in parallel and merge the results.
+        """
+        query = np.asarray(query, dtype=np.float32)
+        futures = [self.executor.submit(self.search_shard, lang, query, k) for lang in self.shards]
+        return merge_results([future.result() for future in futures], k)
+
+
+def merge_results(results, k):
+    """
+    Merge (D, I) pairs from several shards and keep the k closest per query.
+    """
+    D = np.concatenate([d for d, _ in results], axis=1)
+    I = np.concatenate([i for _, i in results], axis=1)
+
+    order = np.argsort(D, axis=1)[:, :k]
+    return np.take_along_axis(D, order, axis=1), np.take_along_axis(I, order, axis=1)